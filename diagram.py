@@ -0,0 +1,101 @@
+"""Side-view SVG diagram of the TV setup."""
+from math import cos, radians, sin
+from layout import KEF_ANGLE_RAD
+
+# --- COLOR PALETTE ---
+COLOR_RED = '#E63946'
+COLOR_HONEYDEW = '#F1FAEE'
+COLOR_LIGHT_BLUE = '#A8DADC'
+COLOR_MED_BLUE = '#457B9D'
+COLOR_DARK_BLUE = '#1D3557'
+COLOR_BLACK = '#000000'
+
+# Arc label sits on the bisector of the KEF theater angle, the only non-zero one drawn
+_LBL_COS = cos(KEF_ANGLE_RAD / 2)
+_LBL_SIN = sin(KEF_ANGLE_RAD / 2)
+
+_COLORS = dict(red=COLOR_RED, light=COLOR_LIGHT_BLUE, med=COLOR_MED_BLUE, dark=COLOR_DARK_BLUE, black=COLOR_BLACK)
+
+# The drawing skeleton never changes between renders, only its coordinates, so it is
+# kept as one format template. Fields ending in `_y` are already flipped into SVG's
+# downward y axis. `lw*`/`fs*` are point sizes scaled to the view width.
+_SVG_TEMPLATE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="-50 -30 {view_w:.1f} {view_h:.1f}" '
+    'width="100%" font-family="sans-serif">\n'
+    '<text x="-50" y="-15" fill="{dark}" font-size="{fs10:.1f}" text-anchor="start">Side View</text>\n'
+    # Floor & Wall
+    '<line x1="-50" y1="{floor_y:.1f}" x2="{x_max:.1f}" y2="{floor_y:.1f}" stroke="{black}" stroke-width="{lw2:.1f}"/>\n'
+    '<line x1="0" y1="{floor_y:.1f}" x2="0" y2="0" stroke="{light}" stroke-width="{lw4:.1f}"/>\n'
+    # TV
+    '<rect x="0" y="{tv_top_y:.1f}" width="5" height="{tv_h:.1f}" fill="{dark}" stroke="{black}" stroke-width="{lw1:.1f}"/>\n'
+    '<text x="-15" y="{centre_y:.1f}" fill="{dark}" font-size="{fs12:.1f}" text-anchor="end" '
+    'dominant-baseline="middle" font-weight="bold">TV</text>\n'
+    # Guides
+    '<line x1="0" y1="{eye_y:.1f}" x2="{dist:.1f}" y2="{eye_y:.1f}" stroke="gray" stroke-width="{lw15:.1f}" '
+    'stroke-opacity="0.4" stroke-dasharray="{dash}"/>\n'
+    '<line x1="0" y1="{centre_y:.1f}" x2="{dist:.1f}" y2="{eye_y:.1f}" stroke="{med}" stroke-width="{lw15:.1f}" '
+    'stroke-opacity="0.8" stroke-dasharray="{dash}"/>\n'
+    '{angle_marker}'
+    # Viewer: spine and legs share one path
+    '<path d="M {dist:.1f} {eye_y:.1f} L {dist:.1f} {hip_y:.1f} M {dist:.1f} {waist_y:.1f} L {foot_x:.1f} {hip_y:.1f}" '
+    'fill="none" stroke="{black}" stroke-width="{lw3:.1f}"/>\n'
+    '<circle cx="{dist:.1f}" cy="{eye_y:.1f}" r="{head_r:.1f}" fill="{black}"/>\n'
+    '<text x="{dist:.1f}" y="{eye_label_y:.1f}" fill="{black}" font-size="{fs10:.1f}" text-anchor="middle">Eye Level</text>\n'
+    # Dimensions
+    '<line x1="20" y1="{floor_y:.1f}" x2="20" y2="{bottom_y:.1f}" stroke="{med}" stroke-width="{lw1:.1f}"/>\n'
+    '<text x="35" y="{bottom_mid_y:.1f}" fill="{med}" font-size="{fs10:.1f}" text-anchor="start" '
+    'dominant-baseline="middle" font-weight="bold">{bottom_cm:.1f} cm</text>\n'
+    '<line x1="0" y1="{bottom_y:.1f}" x2="35" y2="{bottom_y:.1f}" stroke="{med}" stroke-width="{lw05:.1f}"/>\n'
+    '<line x1="0" y1="{dim_y:.1f}" x2="{dist:.1f}" y2="{dim_y:.1f}" stroke="gray" stroke-width="{lw15:.1f}"/>\n'
+    '<text x="{dist_mid:.1f}" y="{dim_label_y:.1f}" fill="gray" font-size="{fs10:.1f}" text-anchor="middle">{dist_m:.2f} m</text>\n'
+    '</svg>'
+)
+
+# SVG's elliptical-arc command draws the arc exactly from its two endpoints
+_ARC_TEMPLATE = (
+    '<path d="M {start_x:.1f} {eye_y:.1f} A {r:.1f} {r:.1f} 0 0 1 {end_x:.1f} {end_y:.1f}" '
+    'fill="none" stroke="{red}" stroke-width="{lw2:.1f}"/>\n'
+    '<text x="{label_x:.1f}" y="{label_y:.1f}" fill="{red}" font-size="{fs9:.1f}" text-anchor="middle" '
+    'font-weight="bold">{angle:.1f}°</text>\n'
+)
+_NEUTRAL_TEMPLATE = (
+    '<text x="{x:.1f}" y="{y:.1f}" fill="gray" font-size="{fs8:.1f}" text-anchor="middle">0° (Neutral Neck)</text>\n'
+)
+
+def draw_diagram_svg(dist_cm, eye_level_cm, tv_bottom_cm, tv_height_cm, tv_centre_cm, vert_angle_deg):
+    """Generates a side-view diagram of the TV setup as an inline SVG string."""
+    room_height = max(250, tv_bottom_cm + tv_height_cm + 50)
+    view_w = dist_cm + 150
+    # One user unit is one cm; `pt` converts typographic point sizes (fonts, strokes) to cm
+    pt = view_w / 560
+
+    def y(v):
+        # SVG's y axis points down, the room's points up
+        return room_height - v
+
+    if vert_angle_deg > 0.5:
+        r = dist_cm * 0.2
+        angle_marker = _ARC_TEMPLATE.format(
+            start_x=dist_cm - r, eye_y=y(eye_level_cm), r=r,
+            end_x=dist_cm - r * cos(radians(vert_angle_deg)),
+            end_y=y(eye_level_cm + r * sin(radians(vert_angle_deg))),
+            label_x=dist_cm - (r * 1.15 * _LBL_COS), label_y=y(eye_level_cm + (r * 1.15 * _LBL_SIN)),
+            angle=vert_angle_deg, lw2=2 * pt, fs9=9 * pt, red=COLOR_RED,
+        )
+    else:
+        angle_marker = _NEUTRAL_TEMPLATE.format(x=dist_cm / 2, y=y(eye_level_cm + 5), fs8=8 * pt)
+
+    return _SVG_TEMPLATE.format(
+        view_w=view_w, view_h=room_height + 35, x_max=dist_cm + 100,
+        floor_y=y(0), tv_top_y=y(tv_bottom_cm + tv_height_cm), tv_h=tv_height_cm, centre_y=y(tv_centre_cm),
+        dist=dist_cm, dist_mid=dist_cm / 2, dist_m=dist_cm / 100, foot_x=dist_cm - 20,
+        eye_y=y(eye_level_cm), waist_y=y(eye_level_cm - 30), hip_y=y(eye_level_cm - 60),
+        eye_label_y=y(eye_level_cm + 25),
+        bottom_y=y(tv_bottom_cm), bottom_mid_y=y(tv_bottom_cm / 2), bottom_cm=tv_bottom_cm,
+        dim_y=y(10), dim_label_y=y(25),
+        angle_marker=angle_marker,
+        head_r=7 * pt, dash=f"{3.7 * 1.5 * pt:.1f} {1.6 * 1.5 * pt:.1f}",
+        lw05=0.5 * pt, lw1=pt, lw15=1.5 * pt, lw2=2 * pt, lw3=3 * pt, lw4=4 * pt,
+        fs10=10 * pt, fs12=12 * pt,
+        **_COLORS
+    )
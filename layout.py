@@ -0,0 +1,19 @@
+"""Shared geometry constants and result type of the TV layout calculation."""
+from math import atan, degrees
+from typing import NamedTuple
+
+# KEF theater-mode formula: the TV centre rises 0.22 cm per cm of viewing distance
+KEF_RATIO = 0.22
+KEF_ANGLE_RAD = atan(KEF_RATIO)
+KEF_ANGLE_DEG = degrees(KEF_ANGLE_RAD)  # ~12.4
+
+# Lives outside the page script: st.cache_data pickles return values, and classes
+# defined in the script's __main__ cannot be pickled from widget callbacks
+class Layout(NamedTuple):
+    final_dist_cm: float
+    tv_centre_cm: float
+    tv_bottom_cm: float
+    screen_height_cm: float
+    screen_width_cm: float
+    vert_angle_deg: float
+    act_horiz_angle_deg: float
@@ -0,0 +1,37 @@
+from streamlit.testing.v1 import AppTest
+
+APP = "../streamlit_app.py"
+
+
+def _metric(at, label):
+    return next(m.value for m in at.metric if m.label == label)
+
+
+def test_first_load():
+    at = AppTest.from_file(APP).run()
+    assert not at.exception
+    assert _metric(at, "Vertical Mounting Angle (Height)") == "0.0°"
+
+
+def test_mode_button_switches_to_cinema():
+    at = AppTest.from_file(APP).run()
+    next(b for b in at.button if "Cinema" in b.label).click().run()
+    assert not at.exception
+    assert at.session_state.setup_mode == 'cinema'
+    assert _metric(at, "Vertical Mounting Angle (Height)") == "12.4°"
+
+
+def test_form_submit_recomputes_layout():
+    at = AppTest.from_file(APP).run()
+    before = at.session_state.layout
+    at.number_input(key="tv_size_inch").set_value(75)
+    next(b for b in at.button if b.label == "Apply").click().run()
+    assert not at.exception
+    assert at.session_state.layout.final_dist_cm > before.final_dist_cm
+
+
+def test_manual_distance_override():
+    at = AppTest.from_file(APP).run()
+    at.checkbox(key="use_manual_dist").check().run()
+    assert not at.exception
+    assert round(at.session_state.layout.final_dist_cm) == 360